@@ -4,12 +4,28 @@ Safe paper trading version for testing with ib_insync
 """
 
 from ib_insync import *
+import asyncio
+import numpy as np
 import pandas as pd
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import threading
+import atexit
 from datetime import datetime
 import time
 import sys
+import re
 import os
+import hashlib
+import functools
+import json
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; the standard json module is used without it
+    orjson = None
 
 # ============================================================================
 # CONFIGURATION
@@ -23,17 +39,38 @@ CLIENT_ID = 1
 # File paths - will be auto-detected in the script directory
 CSV_FILE = 'Alg_ETF_Trading_Strategy-vol-target-2-Final_20251031 (1).csv'
 LOG_FILE = 'trading_log.txt'  # Single log file that appends
+CONTRACT_CACHE_FILE = 'contract_cache.json'  # Qualified contract details reused across runs
+CONTRACT_CACHE_TTL = 86400  # Seconds before a cached contract is qualified again
+CONTRACT_MEMO_SIZE = 4096  # Contracts kept in memory per (symbol, exchange, currency)
 
 # Safety settings
 PAPER_TRADING_ONLY = True  # Set to False only when ready for live trading
 MAX_ORDER_SIZE = 1000  # Maximum shares per order (safety limit)
 
+# Order submission settings
+ORDER_ACK_TIMEOUT = 10  # Seconds to wait for IB to acknowledge an order
+TRADE_FILL_TIMEOUT = 15  # Seconds to wait for orders to fill or cancel before reporting
+IB_MAX_MSG_RATE = 50  # IB API limit on messages per second
+ORDER_RATE = int(IB_MAX_MSG_RATE * 0.9)  # Orders per second, with headroom for other requests
+ORDER_BURST = ORDER_RATE  # Orders that may be sent back-to-back before throttling starts
+CSV_CHUNK_SIZE = 4096  # Rows per chunk when streaming large order files
+ORDER_QUEUE_SIZE = 128  # Built orders buffered between the CSV reader and placement
+ACCOUNT_CACHE_TTL = 2  # Seconds positions/account summary responses are reused
+PREVIEW_ROWS = 20  # Orders listed (with market price) in the pre-trade preview
+
 # ============================================================================
 # LOGGING SETUP (Windows-friendly, no Unicode characters)
 # ============================================================================
 
+# Banner separators, built once instead of on every log call
+SEP60 = '=' * 60
+SEP80 = '=' * 80
+SEP100 = '=' * 100
+
 def setup_logging():
-    """Configure logging to both file and console"""
+    """Configure logging to both file and console via a background listener"""
+    global _log_listener
+    
     # Create formatters
     file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
@@ -48,14 +85,29 @@ def setup_logging():
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(logging.INFO)
     
-    # Configure root logger
+    # File and console writes happen on the listener thread, so logging
+    # never blocks the IB event loop on disk I/O
+    log_queue = queue.Queue(-1)
+    _log_listener = QueueListener(log_queue, file_handler, console_handler,
+                                  respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    
+    # Configure logger
     logger = logging.getLogger(__name__)
     logger.setLevel(logging.INFO)
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    logger.addHandler(QueueHandler(log_queue))
     
     return logger
 
+def flush_logging():
+    """Write out every queued log record before writing to the console directly"""
+    # Stopping the listener drains the queue; it is restarted for later records
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener.start()
+
+_log_listener = None  # Kept referenced so the listener thread is not collected
 logger = setup_logging()
 
 # ============================================================================
@@ -76,10 +128,39 @@ def find_csv_file(csv_filename):
     
     return None
 
+def file_digest(path):
+    """MD5 of a file's contents, read in blocks so memory stays constant"""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def json_line(record):
+    """Serialize a log record as a single compact JSON line"""
+    if orjson is not None:
+        return orjson.dumps(record).decode()
+    return json.dumps(record, separators=(',', ':'))
+
+def ticker_price(ticker):
+    """Best available price from a ticker: market price, then last, then close"""
+    for price in (ticker.marketPrice(), ticker.last, ticker.close):
+        # NaN fails the comparison, so missing values fall through
+        if price and price > 0:
+            return price
+    return None
+
+def format_money(value):
+    """Format a dollar amount for the positions table, N/A when missing"""
+    return 'N/A' if np.isnan(value) else f"${value:,.2f}"
+
 # ============================================================================
 # IB CONNECTION MANAGER
 # ============================================================================
 
+# Paper account IDs start with DU/DF (or mention "paper")
+_ACCT_RE = re.compile(r'(?i)paper|^d[fu]')
+
 class IBConnectionManager:
     """Manages connection to Interactive Brokers"""
     
@@ -90,23 +171,27 @@ class IBConnectionManager:
         self.ib = IB()
         
     def connect(self):
-        """Establish connection to IB TWS/Gateway"""
+        """Establish connection to IB TWS/Gateway (blocking counterpart of disconnect)"""
+        return self.ib.run(self.connect_async())
+    
+    async def connect_async(self):
+        """Establish connection to IB TWS/Gateway without blocking the event loop"""
         try:
-            logger.info(f"Connecting to IB at {self.host}:{self.port}...")
-            self.ib.connect(self.host, self.port, clientId=self.client_id)
+            logger.info("Connecting to IB at %s:%s...", self.host, self.port)
+            await self.ib.connectAsync(self.host, self.port, clientId=self.client_id)
             logger.info("[SUCCESS] Connected to Interactive Brokers")
             
             # Verify paper trading mode
             if PAPER_TRADING_ONLY:
                 accounts = self.ib.managedAccounts()
-                logger.info(f"Connected accounts: {accounts}")
-                if accounts and not any('paper' in acc.lower() or 'df' in acc.lower() or 'du' in acc.lower() for acc in accounts):
+                logger.info("Connected accounts: %s", accounts)
+                if accounts and not any(_ACCT_RE.search(acc) for acc in accounts):
                     logger.warning("[WARNING] This may not be a paper trading account!")
             
             return True
             
         except Exception as e:
-            logger.error(f"[FAILED] Could not connect to IB: {e}")
+            logger.error("[FAILED] Could not connect to IB: %s", e)
             logger.error("Make sure TWS or IB Gateway is running and API connections are enabled")
             return False
     
@@ -116,133 +201,377 @@ class IBConnectionManager:
             self.ib.disconnect()
             logger.info("Disconnected from IB")
         except Exception as e:
-            logger.error(f"Error disconnecting: {e}")
+            logger.error("Error disconnecting: %s", e)
+
+# ============================================================================
+# CONTRACT CACHE
+# ============================================================================
+
+class ContractCache:
+    """File-backed cache of qualified contract details with a TTL"""
+    
+    def __init__(self, path, ttl=CONTRACT_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._entries = self._load()
+    
+    def _load(self):
+        """Load cache entries from disk, starting empty if unreadable"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning("Could not read contract cache %s: %s", self.path, e)
+            return {}
+    
+    @staticmethod
+    def key(symbol, sec_type, exchange, currency):
+        """Cache key for a contract's request parameters"""
+        return hashlib.md5(f"{symbol}|{sec_type}|{exchange}|{currency}".encode()).hexdigest()
+    
+    def get(self, key):
+        """Cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None or entry['expires'] < time.time():
+            return None
+        return entry['value']
+    
+    def set(self, key, value, ttl=None):
+        """Store value under key for ttl seconds (default: cache TTL)"""
+        self._entries[key] = {'value': value, 'expires': time.time() + (ttl or self.ttl)}
+    
+    def save(self):
+        """Write unexpired entries to disk"""
+        now = time.time()
+        entries = {k: v for k, v in self._entries.items() if v['expires'] >= now}
+        try:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning("Could not write contract cache %s: %s", self.path, e)
+
+# ============================================================================
+# RATE LIMITER
+# ============================================================================
+
+class TokenBucket:
+    """Token-bucket limiter allowing short bursts at a sustained rate"""
+    
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        """Add the tokens earned since the last refill, capped at burst"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+    
+    async def acquire(self):
+        """Take one token, sleeping only when the bucket is empty"""
+        # Serialized so concurrent callers cannot spend the same token
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
 
 # ============================================================================
 # ORDER PROCESSOR
 # ============================================================================
 
+# CSV columns used to build contracts and orders
+ORDER_COLUMNS = ['Symbol', 'Action', 'Quantity', 'OrderType', 'Exchange',
+                 'Currency', 'LmtPrice', 'AuxPrice', 'TimeInForce', 'Account']
+ORDER_STRING_COLUMNS = ['Symbol', 'Action', 'OrderType', 'Exchange',
+                        'Currency', 'TimeInForce', 'Account']
+# Every column is read as text; numeric columns are coerced in _normalize so
+# one malformed cell (e.g. Quantity "1.0") drops a row instead of the file
+ORDER_DTYPES = {col: 'string' for col in ORDER_COLUMNS}
+
 class OrderProcessor:
     """Processes and places orders from CSV file"""
     
     def __init__(self, ib_connection):
         self.ib = ib_connection.ib
+        # Contracts memoized by (symbol, exchange, currency), shared by repeat symbols
+        self._stock = functools.lru_cache(maxsize=CONTRACT_MEMO_SIZE)(self._new_stock)
+        # Qualified contract details persisted across runs
+        self._disk_cache = ContractCache(CONTRACT_CACHE_FILE) if CONTRACT_CACHE_FILE else None
+        # Shared limiter keeping order placement under IB's message rate
+        self.throttle = TokenBucket(rate=ORDER_RATE, burst=ORDER_BURST)
+        
+    def _csv_columns(self, csv_path):
+        """Order columns present in the CSV and their explicit dtypes"""
+        # Only materialize the columns the order pipeline uses, as text
+        # so pandas skips dtype inference and never rejects a cell
+        header = pd.read_csv(csv_path, nrows=0).columns
+        usecols = [col for col in ORDER_COLUMNS if col in header]
+        dtype = {col: ORDER_DTYPES[col] for col in usecols}
+        return usecols, dtype
+    
+    def iter_orders_from_csv(self, csv_file, chunksize=CSV_CHUNK_SIZE):
+        """Yield orders from CSV file in chunks so peak memory stays O(chunk)"""
+        csv_path = find_csv_file(csv_file)
+        if csv_path is None:
+            logger.error("[ERROR] CSV file not found: %s", csv_file)
+            return
         
-    def read_orders_from_csv(self, csv_file):
-        """Read and parse orders from CSV file"""
+        logger.info("Streaming orders from CSV: %s", csv_path)
+        usecols, dtype = self._csv_columns(csv_path)
+        with pd.read_csv(csv_path, usecols=usecols, dtype=dtype, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield self._normalize(chunk)
+    
+    def scan_orders(self, csv_file, nrows=PREVIEW_ROWS):
+        """Read the preview head, total order count and content digest of a CSV"""
         try:
-            # Try to find the CSV file
             csv_path = find_csv_file(csv_file)
             if csv_path is None:
-                logger.error(f"[ERROR] CSV file not found: {csv_file}")
-                return None
+                logger.error("[ERROR] CSV file not found: %s", csv_file)
+                return None, 0, None
+            
+            digest = file_digest(csv_path)
+            
+            # The whole file is scanned so the total is exact, but only the
+            # first nrows orders are kept, so memory stays O(chunk)
+            parts = []
+            shown = 0
+            total = 0
+            for chunk in self.iter_orders_from_csv(csv_path):
+                total += len(chunk)
+                if shown < nrows:
+                    parts.append(chunk.head(nrows - shown))
+                    shown += len(parts[-1])
             
-            logger.info(f"Reading orders from CSV: {csv_path}")
-            df = pd.read_csv(csv_path)
-            logger.info(f"[SUCCESS] Found {len(df)} orders in CSV")
-            logger.info(f"Columns: {list(df.columns)}")
-            return df
+            head = pd.concat(parts) if parts else None
+            return head, total, digest
             
         except Exception as e:
-            logger.error(f"[ERROR] Error reading CSV: {e}")
-            return None
+            logger.error("[ERROR] Error reading CSV: %s", e)
+            return None, 0, None
+    
+    def csv_unchanged(self, csv_file, digest):
+        """Check that a CSV still has the contents that were previewed"""
+        csv_path = find_csv_file(csv_file)
+        if csv_path is None or digest is None or file_digest(csv_path) != digest:
+            logger.error("[ERROR] CSV changed since the preview, not submitting: %s", csv_file)
+            return False
+        return True
     
-    def display_orders_preview(self, df):
+    def display_orders_preview(self, df, total=None):
         """Display orders that will be processed"""
         if df is None or df.empty:
             logger.info("\n[NO TRADES] No trades found in CSV to process")
             return
         
-        logger.info(f"\n{'='*80}")
-        logger.info(f"TRADES TO PROCESS: {len(df)} order(s)")
-        logger.info(f"{'='*80}")
+        total = len(df) if total is None else total
+        logger.info("\n%s", SEP80)
+        logger.info("TRADES TO PROCESS: %s order(s)", total)
+        logger.info(SEP80)
+        
+        # Only the head of large files is listed; the rest is streamed on submit
+        shown = df.head(PREVIEW_ROWS)
+        batch = self._prepare_batch(shown)
+        notna = batch['notna']
+        row_numbers = (shown.index.to_numpy() + 1).tolist()
         
-        for idx, row in df.iterrows():
-            action = row.get('Action', 'N/A')
-            quantity = row.get('Quantity', 'N/A')
-            symbol = row.get('Symbol', 'N/A')
-            order_type = row.get('OrderType', 'MKT')
+        for i in range(len(shown)):
+            action = batch['Action'][i] if notna['Action'][i] else 'N/A'
+            quantity = batch['Quantity'][i] if notna['Quantity'][i] else 'N/A'
+            symbol = batch['Symbol'][i] if notna['Symbol'][i] else 'N/A'
+            order_type = batch['OrderType'][i] if notna['OrderType'][i] else 'MKT'
             
             # Get current market price for the symbol
-            current_price = self.get_market_price(symbol, row.get('Exchange', 'SMART'), row.get('Currency', 'USD'))
-            
-            trade_line = f"  {idx + 1}. {action} {quantity} shares of {symbol} @ {order_type}"
+            current_price = None
+            if notna['Symbol'][i]:
+                current_price = self.get_market_price(
+                    symbol,
+                    batch['Exchange'][i] if notna['Exchange'][i] else None,
+                    batch['Currency'][i] if notna['Currency'][i] else None
+                )
             
-            # Add current market price
-            if current_price:
-                trade_line += f" (Current Price: ${current_price:.2f})"
+            # Optional suffixes: current market price and limit price
+            price_note = " (Current Price: $%.2f)" % current_price if current_price else ""
+            limit_note = ""
+            if order_type == 'LMT' and notna['LmtPrice'][i]:
+                limit_note = " (Limit: $%s)" % batch['LmtPrice'][i]
             
-            # Add limit price if available
-            if order_type == 'LMT' and pd.notna(row.get('LmtPrice')):
-                trade_line += f" (Limit: ${row.get('LmtPrice')})"
-            
-            logger.info(trade_line)
+            logger.info("  %s. %s %s shares of %s @ %s%s%s", row_numbers[i], action,
+                        quantity, symbol, order_type, price_note, limit_note)
+        
+        if total > len(shown):
+            logger.info("  ... and %s more order(s)", total - len(shown))
         
-        logger.info(f"{'='*80}\n")
+        logger.info("%s\n", SEP80)
     
     def get_market_price(self, symbol, exchange, currency):
         """Get current market price for a symbol (uses delayed data if live not available)"""
         try:
-            # Create contract
-            contract = Stock(
-                symbol=symbol,
-                exchange=exchange.split('/')[0] if exchange else 'SMART',
-                currency=currency if currency else 'USD'
-            )
-            
-            # Qualify the contract
-            self.ib.qualifyContracts(contract)
+            # Create and qualify the contract (cached for the order loop)
+            contract = self.create_contract(symbol, exchange, currency)
+            if self.qualify_contracts([contract])[0] is None:
+                return None
             
             # Request delayed market data (no subscription required)
             ticker = self.ib.reqMktData(contract, '', False, False)
             self.ib.sleep(2)  # Wait for data
             
-            # Try to get market price
-            price = ticker.marketPrice()
-            
-            # If no market price, try last price or close
-            if not price or price <= 0:
-                if ticker.last and ticker.last > 0:
-                    price = ticker.last
-                elif ticker.close and ticker.close > 0:
-                    price = ticker.close
+            # Market price, falling back to last price or close
+            price = ticker_price(ticker)
             
             # Cancel market data
             self.ib.cancelMktData(contract)
             
-            if price and price > 0:
-                return price
-            
-            return None
+            return price
             
         except Exception as e:
-            logger.warning(f"Could not fetch price for {symbol}: {e}")
+            logger.warning("Could not fetch price for %s: %s", symbol, e)
             return None
     
-    def create_contract(self, row):
-        """Create IB contract object from CSV row"""
+    def _normalize(self, df):
+        """Vectorized cleanup of order columns right after loading"""
+        # Plain float64 so unparseable cells become NaN whatever the dtype backend
+        for col in ('Quantity', 'LmtPrice', 'AuxPrice'):
+            if col in df:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        if 'Action' in df:
+            df['Action'] = df['Action'].str.upper()
+        if 'OrderType' in df:
+            df['OrderType'] = df['OrderType'].fillna('MKT').str.upper()
+        
+        if 'Quantity' not in df:
+            logger.error("[ERROR] CSV has no Quantity column")
+            return df.iloc[0:0]
+        
+        missing = df['Quantity'].isna()
+        if missing.any():
+            logger.error("[ERROR] Skipping %s order(s) with missing Quantity", missing.sum())
+            df = df[~missing]
+        
+        # All checks run on the float column: casting first would wrap huge
+        # values past the size limit and fail the whole chunk on inf.
+        # Fractional quantities are rejected rather than truncated.
+        quantity = df['Quantity'].to_numpy()
+        invalid = ~np.isfinite(quantity) | (quantity <= 0) | (quantity != np.floor(quantity))
+        if invalid.any():
+            logger.error("[ERROR] Skipping %s order(s) with invalid Quantity", invalid.sum())
+        
+        # Safety check
+        oversized = ~invalid & (quantity > MAX_ORDER_SIZE)
+        if oversized.any():
+            logger.warning("[WARNING] Skipping %s order(s) exceeding MAX_ORDER_SIZE %s", oversized.sum(), MAX_ORDER_SIZE)
+        
+        df = df[~(invalid | oversized)]
+        return df.assign(Quantity=df['Quantity'].astype('int64'))
+    
+    def _prepare_batch(self, df):
+        """Extract order columns once as Python lists with NaN masks"""
+        cols = df.reindex(columns=ORDER_COLUMNS)
+        
+        # One vectorized NaN pass over every field instead of pd.notna() per value
+        notna_matrix = ~cols.isna().to_numpy()
+        notna = {col: notna_matrix[:, j].tolist() for j, col in enumerate(ORDER_COLUMNS)}
+        
+        # tolist() yields native str/int/float, so no per-row conversions are needed
+        batch = {col: cols[col].astype(str).tolist() for col in ORDER_STRING_COLUMNS}
+        batch['Quantity'] = cols['Quantity'].fillna(0).astype(np.int64).tolist()
+        batch['LmtPrice'] = cols['LmtPrice'].to_numpy(dtype=np.float64, na_value=np.nan).tolist()
+        batch['AuxPrice'] = cols['AuxPrice'].to_numpy(dtype=np.float64, na_value=np.nan).tolist()
+        batch['notna'] = notna
+        
+        # Rows complete enough to become orders, validated column-wise up front
+        required = [ORDER_COLUMNS.index(col) for col in ('Symbol', 'Action', 'Quantity')]
+        batch['valid_rows'] = np.flatnonzero(notna_matrix[:, required].all(axis=1)).tolist()
+        return batch
+    
+    def create_contract(self, symbol, exchange=None, currency=None):
+        """Create IB contract object from CSV values, reusing cached contracts"""
         try:
-            contract = Stock(
-                symbol=row['Symbol'],
-                exchange=row['Exchange'].split('/')[0] if pd.notna(row.get('Exchange')) else 'SMART',
-                currency=row.get('Currency', 'USD')
-            )
-            return contract
+            exchange = exchange.split('/')[0] if exchange else 'SMART'
+            currency = currency if currency else 'USD'
+            return self._stock(symbol, exchange, currency)
             
         except Exception as e:
-            logger.error(f"Error creating contract for {row.get('Symbol', 'UNKNOWN')}: {e}")
+            logger.error("Error creating contract for %s: %s", symbol, e)
             return None
     
-    def create_order(self, row):
-        """Create IB order object from CSV row"""
+    def _new_stock(self, symbol, exchange, currency):
+        """Build a stock contract, prefilled from the disk cache when possible"""
+        contract = Stock(symbol=symbol, exchange=exchange, currency=currency)
+        
+        # Details qualified in an earlier run make the contract ready
+        # without another contract-details round-trip
+        if self._disk_cache is not None:
+            details = self._disk_cache.get(ContractCache.key(symbol, 'STK', exchange, currency))
+            if details:
+                contract.conId = details['conId']
+                contract.primaryExchange = details['primaryExchange']
+                contract.tradingClass = details['tradingClass']
+        return contract
+    
+    def qualify_contracts(self, contracts):
+        """Qualify contracts in one batch, skipping any already qualified"""
+        return self.ib.run(self.qualify_contracts_async(contracts))
+    
+    async def qualify_contracts_async(self, contracts):
+        """Qualify contracts in one pipelined batch, skipping any already qualified"""
+        # Cached contracts are shared, so dedupe by identity
+        pending = list({id(c): c for c in contracts if not c.conId}.values())
+        
+        if pending:
+            logger.info("Qualifying %s contract(s)...", len(pending))
+            keys = [ContractCache.key(c.symbol, c.secType, c.exchange, c.currency) for c in pending]
+            try:
+                await self.ib.qualifyContractsAsync(*pending)
+            except Exception as e:
+                logger.error("[ERROR] Error qualifying contracts: %s", e)
+            
+            if self._disk_cache is not None:
+                for key, contract in zip(keys, pending):
+                    if contract.conId:
+                        self._disk_cache.set(key, {
+                            'conId': contract.conId,
+                            'primaryExchange': contract.primaryExchange,
+                            'tradingClass': contract.tradingClass,
+                        })
+                self._disk_cache.save()
+        
+        return [contract if contract.conId else None for contract in contracts]
+    
+    async def qualify_all_async(self, df):
+        """Create and qualify the contracts for every order in a DataFrame"""
+        batch = self._prepare_batch(df)
+        notna = batch['notna']
+        contracts = []
+        for i in batch['valid_rows']:
+            contract = self.create_contract(
+                batch['Symbol'][i],
+                batch['Exchange'][i] if notna['Exchange'][i] else None,
+                batch['Currency'][i] if notna['Currency'][i] else None
+            )
+            if contract is not None:
+                contracts.append(contract)
+        
+        return await self.qualify_contracts_async(contracts)
+    
+    def create_order(self, action, quantity, order_type=None, lmt_price=None,
+                     aux_price=None, tif=None, account=None):
+        """Create IB order object from normalized CSV values"""
         try:
-            action = row['Action'].upper()
-            quantity = int(row['Quantity'])
-            order_type = row.get('OrderType', 'MKT').upper()
+            order_type = order_type if order_type else 'MKT'
             
             # Safety check
             if quantity > MAX_ORDER_SIZE:
-                logger.warning(f"[WARNING] Order size {quantity} exceeds MAX_ORDER_SIZE {MAX_ORDER_SIZE}")
+                logger.warning("[WARNING] Order size %s exceeds MAX_ORDER_SIZE %s", quantity, MAX_ORDER_SIZE)
                 return None
             
             # Create base order
@@ -252,197 +581,335 @@ class OrderProcessor:
             order.orderType = order_type
             
             # Add limit price if specified
-            if order_type == 'LMT' and pd.notna(row.get('LmtPrice')):
-                order.lmtPrice = float(row['LmtPrice'])
+            if order_type == 'LMT' and lmt_price is not None:
+                order.lmtPrice = lmt_price
             
             # Add stop price if specified
-            if order_type in ['STP', 'STP LMT'] and pd.notna(row.get('AuxPrice')):
-                order.auxPrice = float(row['AuxPrice'])
+            if order_type in ['STP', 'STP LMT'] and aux_price is not None:
+                order.auxPrice = aux_price
             
             # Time in force
-            order.tif = row.get('TimeInForce', 'DAY')
+            order.tif = tif if tif else 'DAY'
             
             # Add account if specified
-            if pd.notna(row.get('Account')):
-                order.account = row['Account']
+            if account:
+                order.account = account
             
             return order
             
         except Exception as e:
-            logger.error(f"Error creating order: {e}")
+            logger.error("Error creating order: %s", e)
             return None
     
     def place_order(self, contract, order, symbol):
         """Place order with IB"""
         try:
-            logger.info(f"{'='*60}")
-            logger.info(f"Placing {order.action} order:")
-            logger.info(f"  Symbol: {symbol}")
-            logger.info(f"  Quantity: {order.totalQuantity}")
-            logger.info(f"  Order Type: {order.orderType}")
-            if order.orderType == 'LMT':
-                logger.info(f"  Limit Price: ${order.lmtPrice}")
-            logger.info(f"{'='*60}")
-            
-            # Place the order
+            # Place the order (non-blocking, acknowledgement arrives later)
             trade = self.ib.placeOrder(contract, order)
-            
-            # Wait briefly for order to be acknowledged
-            self.ib.sleep(1)
-            
-            logger.info(f"[SUCCESS] Order placed - Order ID: {trade.order.orderId}")
-            logger.info(f"  Status: {trade.orderStatus.status}")
-            
             return trade
             
         except Exception as e:
-            logger.error(f"[ERROR] Error placing order for {symbol}: {e}")
+            logger.error("[ERROR] Error placing order for %s: %s", symbol, e)
             return None
     
-    def process_all_orders(self, csv_file):
-        """Read CSV and process all orders"""
-        df = self.read_orders_from_csv(csv_file)
+    async def _await_ack(self, trade, symbol):
+        """Wait for IB to acknowledge a placed order, then log it"""
+        # An order already past PendingSubmit was acknowledged before we got
+        # here, and its status event will not fire again for that change
+        if trade.orderStatus.status == 'PendingSubmit':
+            try:
+                await asyncio.wait_for(trade.statusEvent, ORDER_ACK_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("[WARNING] Order for %s not acknowledged within %ss", symbol, ORDER_ACK_TIMEOUT)
         
-        if df is None or df.empty:
-            logger.warning("No orders to process")
-            return []
+        # One compact JSON line per order instead of a multi-line banner
+        if logger.isEnabledFor(logging.INFO):
+            order = trade.order
+            logger.info("%s", json_line({
+                'evt': 'order_placed',
+                'sym': symbol,
+                'action': order.action,
+                'qty': order.totalQuantity,
+                'type': order.orderType,
+                'lmt': order.lmtPrice if order.orderType == 'LMT' else None,
+                'id': order.orderId,
+                'status': trade.orderStatus.status,
+            }))
+        return trade
+    
+    async def _await_acks(self, placed):
+        """Await the acknowledgement watchers of (trade, symbol, ack) tuples together"""
+        # Only the slowest acknowledgement is waited for, not one per order
+        results = await asyncio.gather(*[ack for _, _, ack in placed], return_exceptions=True)
         
         trades = []
+        for (trade, symbol, _), result in zip(placed, results):
+            if isinstance(result, Exception):
+                logger.error("[ERROR] Error confirming order for %s: %s", symbol, result)
+            trades.append(trade)
+        return trades
+    
+    async def _trade_done(self, trade):
+        """Resolve once a trade is filled, cancelled or otherwise inactive"""
+        while not trade.isDone():
+            await trade.statusEvent
+        return trade
+    
+    async def wait_for_trades(self, trades, timeout=TRADE_FILL_TIMEOUT):
+        """Wait for trades to finish, returning as soon as all are done"""
+        pending = [asyncio.ensure_future(self._trade_done(trade)) for trade in trades if not trade.isDone()]
+        if not pending:
+            return True
+        
+        _, still_working = await asyncio.wait(pending, timeout=timeout)
+        for task in still_working:
+            task.cancel()
+        
+        if still_working:
+            logger.info("%s order(s) still working after %ss", len(still_working), timeout)
+        return not still_working
+    
+    async def _build_orders_async(self, df):
+        """Build (qualified contract, order, symbol) tuples for a DataFrame"""
+        batch = self._prepare_batch(df)
+        notna = batch['notna']
+        
+        symbols = batch['Symbol']
+        actions = batch['Action']
+        quantities = batch['Quantity']
+        order_types = batch['OrderType']
+        exchanges = batch['Exchange']
+        currencies = batch['Currency']
+        lmt_prices = batch['LmtPrice']
+        aux_prices = batch['AuxPrice']
+        tifs = batch['TimeInForce']
+        accounts = batch['Account']
+        
+        has_order_type = notna['OrderType']
+        has_exchange = notna['Exchange']
+        has_currency = notna['Currency']
+        has_lmt_price = notna['LmtPrice']
+        has_aux_price = notna['AuxPrice']
+        has_tif = notna['TimeInForce']
+        has_account = notna['Account']
+        
+        # Row numbers follow the DataFrame index so they stay correct across chunks
+        row_numbers = (df.index.to_numpy() + 1).tolist()
+        contracts_orders = []
         
-        for idx, row in df.iterrows():
-            logger.info(f"\nProcessing order {idx + 1}/{len(df)}...")
+        valid_rows = batch['valid_rows']
+        skipped = len(symbols) - len(valid_rows)
+        if skipped:
+            logger.error("[ERROR] Skipping %s order(s) missing Symbol, Action or Quantity", skipped)
+        
+        # Checked once per batch rather than inside logger.info for every row
+        log_rows = logger.isEnabledFor(logging.INFO)
+        
+        for i in valid_rows:
+            if log_rows:
+                logger.info("\nProcessing order %s...", row_numbers[i])
+            
+            symbol = symbols[i]
             
             # Create contract
-            contract = self.create_contract(row)
+            contract = self.create_contract(
+                symbol,
+                exchanges[i] if has_exchange[i] else None,
+                currencies[i] if has_currency[i] else None
+            )
             if contract is None:
                 continue
             
             # Create order
-            order = self.create_order(row)
+            order = self.create_order(
+                actions[i],
+                quantities[i],
+                order_types[i] if has_order_type[i] else None,
+                lmt_prices[i] if has_lmt_price[i] else None,
+                aux_prices[i] if has_aux_price[i] else None,
+                tifs[i] if has_tif[i] else None,
+                accounts[i] if has_account[i] else None
+            )
             if order is None:
                 continue
             
-            # Place order
-            trade = self.place_order(contract, order, row['Symbol'])
+            contracts_orders.append((contract, order, symbol))
+        
+        # Resolve all contracts up front instead of one round-trip per order
+        qualified = await self.qualify_contracts_async([contract for contract, _, _ in contracts_orders])
+        ready = []
+        for (contract, order, symbol), q_contract in zip(contracts_orders, qualified):
+            if q_contract is None:
+                logger.error("[ERROR] Could not qualify contract for %s", symbol)
+                continue
+            ready.append((q_contract, order, symbol))
+        return ready
+    
+    async def _consume_orders(self, order_queue):
+        """Place queued orders until the end-of-stream marker arrives"""
+        placed = []
+        while True:
+            item = await order_queue.get()
+            if item is None:
+                return placed
+            contract, order, symbol = item
+            await self.throttle.acquire()
+            trade = self.place_order(contract, order, symbol)
             if trade:
-                trades.append(trade)
-            
-            # Small delay between orders
-            time.sleep(0.5)
+                # Watch for the acknowledgement from the moment of placement
+                ack = asyncio.ensure_future(self._await_ack(trade, symbol))
+                placed.append((trade, symbol, ack))
+    
+    async def process_all_orders_async(self, csv_file):
+        """Stream CSV orders through a queue so placement starts before parsing ends"""
+        loop = asyncio.get_running_loop()
+        chunks = self.iter_orders_from_csv(csv_file)
+        order_queue = asyncio.Queue(maxsize=ORDER_QUEUE_SIZE)
         
-        logger.info(f"\n[COMPLETE] Processed {len(trades)}/{len(df)} orders successfully")
-        return trades
+        # A single consumer: placement is synchronous and throttled, so more
+        # consumers would only interleave orders nondeterministically
+        consumer = asyncio.create_task(self._consume_orders(order_queue))
+        
+        # Counted as chunks arrive so a failure part-way still reports them
+        total = 0
+        try:
+            while True:
+                # Parsing is blocking, so each chunk is read on a worker thread
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    break
+                total += len(chunk)
+                for item in await self._build_orders_async(chunk):
+                    await order_queue.put(item)
+        except Exception as e:
+            logger.error("[ERROR] Error reading CSV: %s", e)
+        finally:
+            chunks.close()
+            await order_queue.put(None)
+        
+        return await self._await_acks(await consumer), total
 
 # ============================================================================
 # POSITION MANAGER
 # ============================================================================
 
+# Account summary tags shown before and after trading
+KEY_METRICS = frozenset({'NetLiquidation', 'TotalCashValue', 'BuyingPower', 'GrossPositionValue'})
+
 class PositionManager:
     """Fetches and displays current positions"""
     
     def __init__(self, ib_connection):
         self.ib = ib_connection.ib
+        # Recent IB responses keyed by request name, as (timestamp, value)
+        self._responses = {}
+    
+    def _cached(self, name):
+        """Return a response fetched within ACCOUNT_CACHE_TTL, or None"""
+        entry = self._responses.get(name)
+        if entry and time.monotonic() - entry[0] < ACCOUNT_CACHE_TTL:
+            return entry[1]
+        return None
+    
+    def _store(self, name, value):
+        """Remember a response for ACCOUNT_CACHE_TTL seconds"""
+        self._responses[name] = (time.monotonic(), value)
+    
+    def invalidate(self):
+        """Drop cached responses; called once orders may have changed them"""
+        self._responses.clear()
     
     def fetch_positions(self):
         """Fetch current positions from IB"""
+        return self.ib.run(self.fetch_positions_async())
+    
+    async def fetch_positions_async(self):
+        """Fetch current positions and their prices from IB"""
         try:
             logger.info("\nFetching current positions...")
-            positions = self.ib.positions()
+            cached = self._cached('positions')
+            if cached is not None:
+                positions, prices = cached
+            else:
+                positions = await self.ib.reqPositionsAsync()
+                prices = []
+                
+                # One batched snapshot request for every position
+                if positions:
+                    try:
+                        tickers = await self.ib.reqTickersAsync(*[pos.contract for pos in positions])
+                        prices = [ticker_price(ticker) for ticker in tickers]
+                    except Exception as e:
+                        logger.warning("Could not fetch position prices: %s", e)
+                        prices = [None] * len(positions)
+                self._store('positions', (positions, prices))
             
             if not positions:
                 logger.info("No open positions found")
                 return []
             
-            logger.info(f"{'='*100}")
-            logger.info(f"{'Symbol':<10} {'Quantity':>10} {'Avg Cost':>12} {'Current Price':>15} {'Market Value':>15} {'Unrealized P&L':>18}")
-            logger.info(f"{'='*100}")
+            quantity = np.asarray([pos.position for pos in positions], dtype=np.float64)
+            avg_cost = np.asarray([pos.avgCost for pos in positions], dtype=np.float64)
+            current_price = np.asarray(prices, dtype=np.float64)
+            
+            # If price not available, value the position at avg cost
+            has_price = ~np.isnan(current_price)
+            market_value = quantity * np.where(has_price, current_price, avg_cost)
+            unrealized_pnl = quantity * (current_price - avg_cost)
             
-            for pos in positions:
-                # Get current market price
-                current_price = self.get_current_price(pos.contract)
+            # The table is only for display, skip building it when INFO is off
+            if logger.isEnabledFor(logging.INFO):
+                table = pd.DataFrame({
+                    'Symbol': [pos.contract.symbol for pos in positions],
+                    'Quantity': quantity,
+                    'Avg Cost': avg_cost,
+                    'Current Price': current_price,
+                    'Market Value': market_value,
+                    'Unrealized P&L': unrealized_pnl,
+                })
+                formatters = {col: format_money for col in table.columns[2:]}
+                formatters['Quantity'] = '{:.0f}'.format
                 
-                if current_price and current_price > 0:
-                    market_value = pos.position * current_price
-                    unrealized_pnl = pos.position * (current_price - pos.avgCost)
-                    
-                    logger.info(
-                        f"{pos.contract.symbol:<10} "
-                        f"{pos.position:>10.0f} "
-                        f"${pos.avgCost:>11.2f} "
-                        f"${current_price:>14.2f} "
-                        f"${market_value:>14.2f} "
-                        f"${unrealized_pnl:>17.2f}"
-                    )
-                else:
-                    # If price not available, use avg cost
-                    market_value = pos.position * pos.avgCost
-                    logger.info(
-                        f"{pos.contract.symbol:<10} "
-                        f"{pos.position:>10.0f} "
-                        f"${pos.avgCost:>11.2f} "
-                        f"{'N/A':>15} "
-                        f"${market_value:>14.2f} "
-                        f"{'N/A':>18}"
-                    )
-            
-            logger.info(f"{'='*100}\n")
+                logger.info(
+                    "%s\n%s\n%s\n",
+                    SEP100, table.to_string(index=False, formatters=formatters), SEP100
+                )
             return positions
             
         except Exception as e:
-            logger.error(f"Error fetching positions: {e}")
+            logger.error("Error fetching positions: %s", e)
             return []
     
-    def get_current_price(self, contract):
-        """Get current market price for a contract (uses delayed data if live not available)"""
-        try:
-            # Request delayed market data (no subscription required)
-            ticker = self.ib.reqMktData(contract, '', False, False)
-            self.ib.sleep(2)  # Wait for data
-            
-            # Try to get market price
-            price = ticker.marketPrice()
-            
-            # If no market price, try last price or close
-            if not price or price <= 0:
-                if ticker.last and ticker.last > 0:
-                    price = ticker.last
-                elif ticker.close and ticker.close > 0:
-                    price = ticker.close
-            
-            # Cancel market data
-            self.ib.cancelMktData(contract)
-            
-            if price and price > 0:
-                return price
-            
-            return None
-            
-        except Exception as e:
-            return None
-    
-    def fetch_account_summary(self):
-        """Fetch account summary information"""
+    async def fetch_account_summary_async(self):
+        """Fetch account summary information without blocking the event loop"""
         try:
             logger.info("Fetching account summary...")
             
-            # Request account summary
-            summary = self.ib.accountSummary()
+            # Request account summary, unless it was fetched moments ago
+            summary = self._cached('summary')
+            if summary is None:
+                summary = await self.ib.accountSummaryAsync()
+                self._store('summary', summary)
             
-            if summary:
-                logger.info(f"{'='*60}")
+            if summary and logger.isEnabledFor(logging.INFO):
+                logger.info(SEP60)
                 logger.info("Account Summary:")
                 
-                key_metrics = ['NetLiquidation', 'TotalCashValue', 'BuyingPower', 'GrossPositionValue']
+                seen = set()
                 for item in summary:
-                    if item.tag in key_metrics:
-                        logger.info(f"  {item.tag}: {item.value} {item.currency}")
+                    if item.tag in KEY_METRICS and item.tag not in seen:
+                        logger.info("  %s: %s %s", item.tag, item.value, item.currency)
+                        seen.add(item.tag)
+                        # Stop scanning once every key metric has been shown
+                        if len(seen) == len(KEY_METRICS):
+                            break
                 
-                logger.info(f"{'='*60}\n")
+                logger.info("%s\n", SEP60)
             
             return summary
             
         except Exception as e:
-            logger.error(f"Error fetching account summary: {e}")
+            logger.error("Error fetching account summary: %s", e)
             return None
 
 # ============================================================================
@@ -456,28 +923,42 @@ class AutoTradingSystem:
         self.connection = None
         self.order_processor = None
         self.position_manager = None
+        self.orders_df = None
+        self.order_count = 0
+        self.csv_digest = None
     
-    def initialize(self):
-        """Initialize all components"""
-        logger.info("="*80)
+    def initialize(self, csv_file=None):
+        """Initialize all components, scanning the CSV while connecting"""
+        logger.info(SEP80)
         logger.info("IB AUTO TRADING SYSTEM - PAPER TRADING MODE")
-        logger.info("="*80)
+        logger.info(SEP80)
         
         if PAPER_TRADING_ONLY:
             logger.info("[SAFETY MODE] Paper trading only")
         else:
             logger.warning("[WARNING] Live trading mode enabled!")
         
-        # Connect to IB
+        # Initialize components
         self.connection = IBConnectionManager(IB_HOST, IB_PORT, CLIENT_ID)
-        if not self.connection.connect():
-            return False
-        
-        # Initialize processors
         self.order_processor = OrderProcessor(self.connection)
         self.position_manager = PositionManager(self.connection)
         
-        return True
+        return self.connection.ib.run(self.initialize_async(csv_file))
+    
+    async def initialize_async(self, csv_file=None):
+        """Connect to IB and read the orders to preview concurrently"""
+        tasks = [self.connection.connect_async()]
+        if csv_file:
+            # Parsing is blocking, so it runs on a worker thread while the
+            # event loop handles the IB handshake; only the preview head is
+            # kept, the full file is streamed again when orders are submitted
+            loop = asyncio.get_running_loop()
+            tasks.append(loop.run_in_executor(None, self.order_processor.scan_orders, csv_file))
+        
+        results = await asyncio.gather(*tasks)
+        if csv_file:
+            self.orders_df, self.order_count, self.csv_digest = results[1]
+        return results[0]
     
     def preview_trades(self, csv_file):
         """Preview trades before confirmation"""
@@ -485,73 +966,111 @@ class AutoTradingSystem:
         logger.info("\n--- CURRENT POSITIONS ---")
         self.position_manager.fetch_positions()
         
-        # Then preview upcoming trades
-        df = self.order_processor.read_orders_from_csv(csv_file)
-        self.order_processor.display_orders_preview(df)
+        # Then preview upcoming trades, reusing the scan made during initialize
+        df = self.orders_df
+        if df is None:
+            df, self.order_count, self.csv_digest = self.order_processor.scan_orders(csv_file)
+        
+        # Qualify the previewed contracts in one pipelined batch; the price
+        # lookups below reuse them and the rest are qualified on submit
+        if df is not None and not df.empty:
+            self.connection.ib.run(self.order_processor.qualify_all_async(df.head(PREVIEW_ROWS)))
+        
+        self.order_processor.display_orders_preview(df, self.order_count)
         return df
     
-    def run(self, csv_file, df):
+    def confirm(self, prompt):
+        """Ask the user a question without stalling the IB connection"""
+        return self.connection.ib.run(self.confirm_async(prompt))
+    
+    async def confirm_async(self, prompt):
+        """Read the answer on a worker thread while the event loop keeps reading IB"""
+        loop = asyncio.get_running_loop()
+        answer = loop.create_future()
+        
+        def resolve(setter, value):
+            if not answer.done():
+                setter(value)
+        
+        def ask():
+            try:
+                response = input(prompt)
+            except Exception as e:
+                loop.call_soon_threadsafe(resolve, answer.set_exception, e)
+            else:
+                loop.call_soon_threadsafe(resolve, answer.set_result, response)
+        
+        # Preview lines are still queued for the log listener; write them
+        # out first so the prompt appears after them
+        flush_logging()
+        
+        # A daemon thread, unlike the default executor, does not keep the
+        # process alive if Ctrl-C abandons the prompt
+        threading.Thread(target=ask, daemon=True).start()
+        response = await answer
+        return response.strip().lower()
+    
+    def run(self, csv_file):
         """Execute the trading workflow"""
         try:
-            # Show account summary before trading
-            logger.info("\n--- ACCOUNT SUMMARY ---")
-            self.position_manager.fetch_account_summary()
-            
-            # Process orders from CSV
-            logger.info("\n--- PROCESSING ORDERS ---")
-            
-            if df is None or df.empty:
-                logger.warning("No orders to process")
-                trades = []
-            else:
-                trades = []
-                for idx, row in df.iterrows():
-                    logger.info(f"\nProcessing order {idx + 1}/{len(df)}...")
-                    
-                    # Create contract
-                    contract = self.order_processor.create_contract(row)
-                    if contract is None:
-                        continue
-                    
-                    # Create order
-                    order = self.order_processor.create_order(row)
-                    if order is None:
-                        continue
-                    
-                    # Place order
-                    trade = self.order_processor.place_order(contract, order, row['Symbol'])
-                    if trade:
-                        trades.append(trade)
-                    
-                    # Small delay between orders
-                    time.sleep(0.5)
-                
-                logger.info(f"\n[COMPLETE] Processed {len(trades)}/{len(df)} orders successfully")
-            
-            # Wait for orders to be processed
-            if trades:
-                logger.info("\nWaiting for orders to be processed...")
-                time.sleep(3)
-            
-            # Show updated positions after trading
-            logger.info("\n--- AFTER TRADING ---")
-            self.position_manager.fetch_positions()
-            self.position_manager.fetch_account_summary()
-            
-            # Summary
-            logger.info("\n" + "="*80)
-            logger.info(f"TRADING SESSION SUMMARY")
-            logger.info(f"Orders processed: {len(trades)}")
-            logger.info(f"Log file: {LOG_FILE}")
-            logger.info("="*80)
-            
+            self.connection.ib.run(self.run_async(csv_file))
         except KeyboardInterrupt:
             logger.info("\n[INTERRUPTED] Trading interrupted by user")
         except Exception as e:
-            logger.error(f"Error during trading: {e}")
+            logger.error("Error during trading: %s", e)
         finally:
             self.shutdown()
     
+    async def run_async(self, csv_file):
+        """Execute the trading workflow on the IB event loop"""
+        # Show account summary before trading while a worker thread checks
+        # that the CSV is still the one previewed; both are independent, so
+        # the IB round-trip overlaps the file read
+        logger.info("\n--- ACCOUNT SUMMARY ---")
+        loop = asyncio.get_running_loop()
+        _, unchanged = await asyncio.gather(
+            self.position_manager.fetch_account_summary_async(),
+            loop.run_in_executor(None, self.order_processor.csv_unchanged, csv_file, self.csv_digest)
+        )
+        
+        # Only the orders the user previewed may be submitted
+        if not unchanged:
+            return
+        
+        # Process orders from CSV
+        logger.info("\n--- PROCESSING ORDERS ---")
+        
+        # Orders are read, qualified and queued chunk by chunk, so placement
+        # starts with the first chunk and memory stays O(chunk)
+        trades, total = await self.order_processor.process_all_orders_async(csv_file)
+        
+        # Placed orders are the only thing that changes account state
+        self.position_manager.invalidate()
+        if total == 0:
+            logger.warning("No orders to process")
+        else:
+            logger.info("\n[COMPLETE] Processed %s/%s orders successfully", len(trades), total)
+        
+        # Wait for orders to fill or be cancelled, up to TRADE_FILL_TIMEOUT
+        if trades:
+            logger.info("\nWaiting for orders to be processed...")
+            await self.order_processor.wait_for_trades(trades)
+        
+        # Show updated positions after trading; both requests are
+        # read-only and independent, so their round-trips overlap
+        logger.info("\n--- AFTER TRADING ---")
+        await asyncio.gather(
+            self.position_manager.fetch_positions_async(),
+            self.position_manager.fetch_account_summary_async()
+        )
+        
+        # Summary
+        logger.info("\n%s", SEP80)
+        logger.info("TRADING SESSION SUMMARY")
+        logger.info("Orders processed: %s", len(trades))
+        logger.info("Log file: %s", LOG_FILE)
+        logger.info(SEP80)
+    
     def shutdown(self):
         """Clean shutdown"""
         logger.info("\nShutting down...")
@@ -567,24 +1086,27 @@ def main():
     """Main entry point"""
     
     # Log session start
-    logger.info("\n" + "="*80)
-    logger.info(f"NEW TRADING SESSION STARTED - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    logger.info("="*80)
+    logger.info("\n%s", SEP80)
+    logger.info("NEW TRADING SESSION STARTED - %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    logger.info(SEP80)
     
     # Initialize system
     system = AutoTradingSystem()
     
-    if not system.initialize():
+    if not system.initialize(CSV_FILE):
         logger.error("Failed to initialize trading system")
         return
     
     # Preview trades and show account info
-    df = system.preview_trades(CSV_FILE)
+    system.preview_trades(CSV_FILE)
     
-    # Ask for confirmation
-    print("\n" + "="*80)
-    response = input("Do you want to proceed? (yes/no): ").strip().lower()
-    print("="*80 + "\n")
+    # Ask for confirmation; the IB socket keeps being serviced meanwhile
+    logger.info("\n%s", SEP80)
+    try:
+        response = system.confirm("Do you want to proceed? (yes/no): ")
+    except (KeyboardInterrupt, EOFError):
+        response = None
+    logger.info("%s\n", SEP80)
     
     if response != 'yes':
         logger.info("Trading cancelled by user")
@@ -592,7 +1114,7 @@ def main():
         return
     
     # Run trading
-    system.run(CSV_FILE, df)
+    system.run(CSV_FILE)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file